@@ -5,80 +5,364 @@ Analyzes any codebase and generates comprehensive README documentation
 
 import os
 import sys
+import subprocess
 import json
+import hashlib
+import re
+import time
 import requests
 import argparse
+import logging
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Set
-import mimetypes
 from groq import Groq
 
+try:
+    import orjson  # Optional: much faster JSON parsing and pretty-printing
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+try:
+    import diskcache  # Optional: persistent cache of model responses
+except ImportError:
+    diskcache = None
+
+logger = logging.getLogger('readme_generator')
+
+# Include as many common programming, scripting, markup, and config languages as possible
+_SUPPORTED_EXTENSIONS = frozenset({
+    # Programming languages
+    '.py', '.js', '.ts', '.java', '.cpp', '.c', '.h', '.hpp', '.cs', '.php', '.rb', '.go', '.rs', '.swift', '.kt', '.kts',
+    '.scala', '.r', '.m', '.jl', '.dart', '.pl', '.pm', '.lua', '.groovy', '.vb', '.vbs', '.fs', '.fsi', '.fsx', '.f90', '.f95',
+    '.f', '.f03', '.f08', '.asm', '.s', '.d', '.nim', '.clj', '.cljs', '.cljc', '.edn', '.erl', '.hrl', '.ex', '.exs', '.elm',
+    '.ml', '.mli', '.mll', '.mly', '.hs', '.lhs', '.purs', '.ada', '.adb', '.ads', '.v', '.sv', '.vhd', '.vhdl', '.cob', '.cbl',
+    '.lisp', '.lsp', '.scm', '.rkt', '.ss', '.awk', '.ps1', '.bat', '.cmd', '.sh', '.zsh', '.fish', '.tcsh', '.csh', '.bsh',
+    '.tcl', '.exp', '.expect', '.bas', '.pas', '.pp', '.dpr', '.cr', '.vala', '.hx', '.hxsl', '.hxproj',
+    '.mm', '.objc', '.objcpp', '.cu', '.cuh', '.cl', '.opencl', '.glsl', '.vert', '.frag', '.comp', '.tesc', '.tese',
+    '.geom', '.wgsl', '.metal', '.vapi', '.odin', '.zig', '.pony', '.factor',
+    '.cc', '.cxx', '.c++', '.hh', '.hxx', '.h++', '.mjs', '.cjs', '.ksh', '.tk',
+    # Web/markup/template
+    '.html', '.htm', '.xhtml', '.xml', '.svg', '.xsd', '.xslt', '.jsp', '.asp', '.aspx', '.ejs', '.hbs', '.handlebars', '.mustache',
+    '.twig', '.liquid', '.jade', '.pug', '.haml', '.slim', '.mjml', '.md', '.markdown', '.rst', '.adoc', '.asciidoc',
+    '.tex', '.latex', '.sty', '.cls', '.bib', '.rmd', '.ipynb', '.ltx', '.roff', '.sgml', '.sgm', '.shtml',
+    '.dot', '.gv', '.vtt', '.srt',
+    # Stylesheets
+    '.css', '.scss', '.sass', '.less', '.styl', '.pcss', '.sss',
+    # Data/config
+    '.json', '.jsonc', '.json5', '.yaml', '.yml', '.toml', '.ini', '.cfg', '.conf', '.env', '.properties', '.prop', '.prefs',
+    '.plist', '.rc', '.config', '.tsv', '.csv', '.psv', '.db', '.sqlite', '.db3', '.sql', '.dbf',
+    # Build/package
+    '.gradle', '.maven', '.pom', '.sbt', '.cmake', '.make', '.mak', '.mk', '.ninja', '.bazel', '.bzl', '.buck', '.build',
+    '.pro', '.pri', '.qbs', '.xcconfig', '.xcworkspace', '.xcodeproj', '.xcsettings', '.xcuserstate', '.xcuserdata',
+    '.nuspec', '.csproj', '.vbproj', '.fsproj', '.sln', '.vcxproj', '.vcproj', '.props', '.targets', '.gyp', '.gypi',
+    '.am', '.ac', '.m4', '.autogen', '.configure', '.spec', '.ebuild', '.mix', '.rebar', '.rebar.config',
+    '.cargo', '.cargo.toml', '.cargo.lock', '.go.mod', '.go.sum', '.composer.json', '.composer.lock', '.package.json',
+    '.package-lock.json', '.yarn.lock', '.pnpm-lock.yaml', '.requirements.txt', '.pyproject.toml',
+    '.setup.py', '.setup.cfg', '.tox', '.flake8', '.mypy.ini', '.pytest.ini', '.coveragerc', '.babelrc', '.eslintrc',
+    '.eslintignore', '.prettierrc', '.prettierignore', '.stylelintrc', '.stylelintignore', '.editorconfig', '.gitattributes',
+    '.gitignore', '.dockerfile', '.docker-compose.yml', '.docker-compose.yaml', '.vagrantfile', '.heroku.yml',
+    '.appveyor.yml', '.travis.yml', '.circleci', '.github', '.gitlab-ci.yml', '.bitbucket-pipelines.yml', '.azure-pipelines.yml',
+    '.jenkinsfile', '.buildkite.yml', '.codeclimate.yml', '.dependabot.yml', '.renovate.json', '.sonarcloud.properties',
+    # Misc
+    '.txt', '.log', '.out', '.err', '.lst', '.list', '.changelog', '.changes', '.news', '.todo', '.tasks', '.license', '.licence',
+    '.copying', '.notice', '.authors', '.contributors', '.credits', '.readme', '.readme.md', '.readme.txt', '.readme.rst',
+    '.text', '.diff', '.patch'
+})
+
+# Common text files that have no extension
+_TEXT_FILENAMES = frozenset({'makefile', 'dockerfile', 'readme', 'license', 'changelog'})
+
+# Directories that never contain source worth analyzing
+_SKIP_DIRS = frozenset({
+    'node_modules', '.git', '.svn', '.hg', '__pycache__',
+    '.pytest_cache', '.mypy_cache', 'venv', 'env', '.env',
+    'build', 'dist', '.next', '.nuxt', 'target', 'bin', 'obj',
+    '.idea', '.vscode', '.vs', 'coverage', '.coverage',
+    'logs', 'log', 'tmp', 'temp', '.tmp', '.temp'
+})
+
+# Package/config files that always go to the model for framework detection
+_KEY_FILENAMES = frozenset({
+    'package.json', 'requirements.txt', 'pom.xml', 'build.gradle',
+    'cargo.toml', 'go.mod', 'composer.json', 'pyproject.toml',
+    'setup.py', 'dockerfile', 'docker-compose.yml', 'makefile'
+})
+
+# Filename fragments that mark main application files
+_KEY_NAME_RE = re.compile(r'main|index|app|server|__init__')
+
+# Path fragments of entry point and config files that the README prompt
+# always shows first when they are among the sampled files
+_IMPORTANT_PATH_RE = re.compile(r'main|index|app|server|__init__|setup|config')
+
+# Keywords near the top of a file that reveal which frameworks it uses
+# (whole words only, so e.g. "important" or "fromage" do not count)
+_IMPORT_RE = re.compile(r'\b(?:import|require|include|using|from)\b', re.IGNORECASE)
+
+# Keywords that point at API keys, env vars or CLI arguments worth documenting
+_SETUP_RE = re.compile(r'argparse|os\.getenv|api_key|api key|secret_key', re.IGNORECASE)
+
+# Config files and basic package managers recorded in the analysis
+_CONFIG_FILENAMES = frozenset({
+    'package.json', 'yarn.lock', 'package-lock.json',
+    'requirements.txt', 'pyproject.toml', 'setup.py', 'pipfile',
+    'pom.xml', 'build.gradle', 'build.gradle.kts',
+    'cargo.toml', 'cargo.lock',
+    'go.mod', 'go.sum',
+    'composer.json', 'composer.lock',
+    'dockerfile', 'docker-compose.yml',
+    'makefile', '.gitignore', 'readme.md'
+})
+
+# Where model responses are cached between runs, and for how long
+_CACHE_DIR = Path.home() / '.readme_gen_cache'
+_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Upper bound on bytes read per file. At most _PROMPT_SNIPPET_CHARS characters
+# go to the model and the import scan looks at the first 500, so 64 KiB covers
+# every source file worth reading while lockfiles and minified bundles stay
+# cheap. Sizes come from stat and are exact; line counts of larger files only
+# cover the part that was read, so they are a lower bound.
+_MAX_READ_BYTES = 64 * 1024
+
+# Read budget: once this many files or bytes have been scheduled for reading,
+# remaining files are only recorded by name and size. The model sees a handful
+# of files at most, so huge repositories gain nothing from reading them all.
+_READ_BUDGET_FILES = 500
+_READ_BUDGET_BYTES = 8 * 1024 * 1024
+
+# Files larger than this (logs, data dumps, generated bundles) are recorded by
+# name and size only; they never make useful snippets
+_MAX_ANALYZED_SIZE = 2 * 1024 * 1024
+
+# Total characters of file snippets in the prompt (characters stand in for
+# tokens), so prompt size and latency stay predictable. Snippets keep a head
+# this long, since one file may get the whole budget when the others are short.
+_PROMPT_SNIPPET_CHARS = 12000
+
+# The prompt lists the first _PROMPT_SAMPLE_FILES files of the walk and shows
+# snippets of at most _PROMPT_KEY_FILES files
+_PROMPT_SAMPLE_FILES = 20
+_PROMPT_KEY_FILES = 10
+
+# The prompt is built as static instructions followed by the repository data
+# so that the unchanging prefix is byte-identical across requests and can be
+# served from Groq's prompt cache. One request returns both the framework
+# detection and the README to save a round-trip.
+_SYSTEM_PROMPT = "You are an expert software engineer and technical writer. You identify frameworks, technologies, and project types from code, and you generate comprehensive, professional README files that are clear, well-structured, and include all necessary information for users to understand and use the project."
+
+_INSTRUCTIONS = """
+Based on the repository analysis at the end of this message, complete two tasks.
+
+TASK 1 - Detect frameworks, technologies, and project type:
+
+1. **Frameworks**: All frameworks being used (e.g., React, Django, Express.js, Spring Boot, etc.)
+2. **Technologies**: Technologies, libraries, and tools (e.g., Docker, Redis, PostgreSQL, etc.)
+3. **Project Type**: What type of project this is (e.g., Web Application, API, CLI Tool, Library, etc.)
+
+Be comprehensive and look for evidence in:
+- Package/dependency files (package.json, requirements.txt, etc.)
+- Import statements and includes
+- Configuration files
+- Code patterns and structure
+
+TASK 2 - Generate a comprehensive README.md file that includes:
+
+1. **Project Title and Description**: Clear, engaging description of what the project does
+2. **Features**: Key features and capabilities
+3. **Technology Stack**: Languages, frameworks, and tools used
+4. **Prerequisites**: System requirements, dependencies, and **any API keys or environment variables needed**. Look for clues like `os.getenv`, `argparse`, or variable names like `API_KEY`.
+5. **Installation**: Step-by-step setup instructions IF ANY REQUIRED
+6. **Usage**: How to run and use the project with examples. Include command-line arguments if found.
+7. **Project Structure**: Overview of the codebase organization
+8. **Configuration**: Any environment variables or config files needed
+9. **API Documentation**: If applicable, document key endpoints or functions IF ANY PRESENT
+10. **Contributing**: Guidelines for contributors
+11. **License**: License information IF ALREADY MENTIONED
+12. **Contact**: Author/maintainer information IF ALREADY MENTIONED
+
+Make the README professional, well-formatted with proper markdown, and comprehensive enough that someone can understand and set up the project from scratch.
+Pay close attention to the code snippets to find requirements like API keys or specific commands to run the project.
+
+OUTPUT FORMAT - respond with exactly these two blocks and nothing else:
+
+<ANALYSIS_JSON>
+{
+    "frameworks": ["Framework1", "Framework2", ...],
+    "technologies": ["Technology1", "Technology2", ...],
+    "project_type": "Project Type Description"
+}
+</ANALYSIS_JSON>
+<README_MD>
+...the complete README.md in markdown...
+</README_MD>
+
+=== REPOSITORY ANALYSIS ===
+"""
+
+# Sentinel-delimited blocks in the model response
+_ANALYSIS_BLOCK_RE = re.compile(r'<ANALYSIS_JSON>(.*?)</ANALYSIS_JSON>', re.DOTALL)
+# Outermost JSON object, for when the model wraps it in extra text
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+_README_OPEN = '<README_MD>'
+_README_CLOSE = '</README_MD>'
+
+class FileCache:
+    """Minimal stand-in for diskcache.Cache: one JSON file per key"""
+    
+    def __init__(self, directory: Path):
+        self.directory = directory
+    
+    def get(self, key: str):
+        path = self.directory / f"{key}.json"
+        try:
+            with open(path, 'rb') as f:
+                entry = _json_loads(f.read())
+        except OSError:
+            return None
+        except ValueError:
+            entry = None
+        if not isinstance(entry, dict) or entry.get('expires', 0) < time.time():
+            # Expired or corrupt; remove it so the directory does not grow
+            self._remove(path)
+            return None
+        return entry.get('value')
+    
+    def set(self, key: str, value, expire: float):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write then rename, so a concurrent reader never sees half a file
+            tmp_path = self.directory / f"{key}.json.{os.getpid()}.tmp"
+            write_json(tmp_path, {'expires': time.time() + expire, 'value': value})
+            os.replace(tmp_path, self.directory / f"{key}.json")
+        except OSError as e:
+            logger.warning("Warning: Could not write response cache: %s", e)
+            return
+        self._remove_expired(expire)
+    
+    def _remove_expired(self, expire: float):
+        """Delete entries of other keys that have outlived expire
+        
+        All entries share one TTL, so an entry written before now - expire
+        has expired; the file time saves opening every entry. Temp files
+        left behind by interrupted writes age out the same way. Cleanup is
+        best effort and never raises.
+        """
+        cutoff = time.time() - expire
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(('.json', '.tmp')):
+                        continue
+                    try:
+                        expired = entry.stat().st_mtime < cutoff
+                    except OSError:
+                        # Removed by another process while we were scanning
+                        continue
+                    if expired:
+                        self._remove(entry.path)
+        except OSError:
+            pass
+    
+    @staticmethod
+    def _remove(path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+class ReadmeStreamWriter:
+    """Write the <README_MD> block of a streamed model response as it arrives"""
+    
+    def __init__(self, output_file=None):
+        self.output_file = output_file
+        self.parts = []      # Full response text seen so far
+        self.written = []    # README text emitted so far
+        self.buffer = ''
+        self.state = 'before'  # before -> inside -> done
+    
+    def _emit(self, text: str):
+        if text:
+            self.written.append(text)
+            if self.output_file is not None:
+                self.output_file.write(text)
+                # Flush so the file grows as the model writes
+                self.output_file.flush()
+    
+    def feed(self, text: str):
+        """Consume the next piece of the response"""
+        self.parts.append(text)
+        if self.state == 'done':
+            return
+        self.buffer += text
+        
+        if self.state == 'before':
+            start = self.buffer.find(_README_OPEN)
+            if start == -1:
+                # Keep just enough to match an opening tag split across chunks
+                self.buffer = self.buffer[-(len(_README_OPEN) - 1):]
+                return
+            self.buffer = self.buffer[start + len(_README_OPEN):]
+            self.state = 'inside'
+        
+        if not self.written:
+            self.buffer = self.buffer.lstrip()
+        
+        end = self.buffer.find(_README_CLOSE)
+        if end != -1:
+            self._emit(self.buffer[:end].rstrip())
+            self.buffer = ''
+            self.state = 'done'
+            return
+        
+        # Hold back a possible partial closing tag and trailing whitespace
+        safe = self.buffer[:max(len(self.buffer) - (len(_README_CLOSE) - 1), 0)].rstrip()
+        self._emit(safe)
+        self.buffer = self.buffer[len(safe):]
+    
+    def close(self) -> str:
+        """Flush what is left and return the README text"""
+        if self.state == 'inside':
+            # Response was cut off before the closing tag, or partway through it
+            text = self.buffer
+            for length in range(len(_README_CLOSE) - 1, 0, -1):
+                if text.endswith(_README_CLOSE[:length]):
+                    text = text[:-length]
+                    break
+            self._emit(text.rstrip())
+        elif self.state == 'before':
+            # The model ignored the output format; keep whatever is not the analysis block
+            self._emit(_ANALYSIS_BLOCK_RE.sub('', ''.join(self.parts)).strip())
+        self._emit('\n')
+        self.state = 'done'
+        return ''.join(self.written)
+
 class RepositoryAnalyzer:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, use_cache: bool = True):
         """Initialize with Groq API key"""
         self.client = Groq(api_key=api_key)
-        # Include as many common programming, scripting, markup, and config languages as possible
-        self.supported_extensions = {
-            # Programming languages
-            '.py', '.js', '.ts', '.java', '.cpp', '.c', '.h', '.hpp', '.cs', '.php', '.rb', '.go', '.rs', '.swift', '.kt', '.kts',
-            '.scala', '.r', '.m', '.jl', '.dart', '.pl', '.pm', '.lua', '.groovy', '.vb', '.vbs', '.fs', '.fsi', '.fsx', '.f90', '.f95',
-            '.f', '.f03', '.f08', '.asm', '.s', '.d', '.nim', '.clj', '.cljs', '.cljc', '.edn', '.erl', '.hrl', '.ex', '.exs', '.elm',
-            '.ml', '.mli', '.mll', '.mly', '.hs', '.lhs', '.purs', '.ada', '.adb', '.ads', '.v', '.sv', '.vhd', '.vhdl', '.cob', '.cbl',
-            '.lisp', '.lsp', '.scm', '.rkt', '.ss', '.awk', '.ps1', '.bat', '.cmd', '.sh', '.zsh', '.fish', '.tcsh', '.csh', '.bsh',
-            '.tcl', '.exp', '.expect', '.bas', '.pas', '.pp', '.dpr', '.go', '.rs', '.cr', '.nim', '.vala', '.hx', '.hxsl', '.hxproj',
-            '.m', '.mm', '.objc', '.objcpp', '.cu', '.cuh', '.cl', '.opencl', '.glsl', '.vert', '.frag', '.comp', '.tesc', '.tese',
-            '.geom', '.wgsl', '.metal', '.asm', '.s', '.S', '.d', '.vala', '.vapi', '.nim', '.odin', '.zig', '.pony', '.factor',
-            # Web/markup/template
-            '.html', '.htm', '.xhtml', '.xml', '.svg', '.xsd', '.xslt', '.jsp', '.asp', '.aspx', '.ejs', '.hbs', '.handlebars', '.mustache',
-            '.twig', '.liquid', '.jade', '.pug', '.haml', '.slim', '.mjml', '.md', '.markdown', '.rst', '.adoc', '.asciidoc',
-            '.tex', '.latex', '.sty', '.cls', '.bib', '.rmd', '.ipynb',
-            # Stylesheets
-            '.css', '.scss', '.sass', '.less', '.styl', '.pcss', '.sss',
-            # Data/config
-            '.json', '.jsonc', '.json5', '.yaml', '.yml', '.toml', '.ini', '.cfg', '.conf', '.env', '.properties', '.prop', '.prefs',
-            '.plist', '.rc', '.config', '.tsv', '.csv', '.psv', '.db', '.sqlite', '.db3', '.sql', '.dbf',
-            # Build/package
-            '.gradle', '.maven', '.pom', '.sbt', '.cmake', '.make', '.mak', '.mk', '.ninja', '.bazel', '.bzl', '.buck', '.build',
-            '.pro', '.pri', '.qbs', '.xcconfig', '.xcworkspace', '.xcodeproj', '.xcsettings', '.xcuserstate', '.xcuserdata',
-            '.nuspec', '.csproj', '.vbproj', '.fsproj', '.sln', '.vcxproj', '.vcproj', '.props', '.targets', '.gyp', '.gypi',
-            '.am', '.ac', '.m4', '.autogen', '.configure', '.spec', '.ebuild', '.exs', '.mix', '.rebar', '.rebar.config',
-            '.cargo', '.cargo.toml', '.cargo.lock', '.go.mod', '.go.sum', '.composer.json', '.composer.lock', '.package.json',
-            '.package-lock.json', '.yarn.lock', '.pnpm-lock.yaml', '.requirements.txt', '.Pipfile', '.Pipfile.lock', '.pyproject.toml',
-            '.setup.py', '.setup.cfg', '.tox', '.flake8', '.mypy.ini', '.pytest.ini', '.coveragerc', '.babelrc', '.eslintrc',
-            '.eslintignore', '.prettierrc', '.prettierignore', '.stylelintrc', '.stylelintignore', '.editorconfig', '.gitattributes',
-            '.gitignore', '.dockerfile', '.docker-compose.yml', '.docker-compose.yaml', '.vagrantfile', '.Procfile', '.heroku.yml',
-            '.appveyor.yml', '.travis.yml', '.circleci', '.github', '.gitlab-ci.yml', '.bitbucket-pipelines.yml', '.azure-pipelines.yml',
-            '.jenkinsfile', '.buildkite.yml', '.codeclimate.yml', '.dependabot.yml', '.renovate.json', '.sonarcloud.properties',
-            # Misc
-            '.txt', '.log', '.out', '.err', '.lst', '.list', '.changelog', '.changes', '.news', '.todo', '.tasks', '.license', '.licence',
-            '.copying', '.notice', '.authors', '.contributors', '.credits', '.readme', '.readme.md', '.readme.txt', '.readme.rst'
-        }
-    def is_text_file(self, file_path: Path) -> bool:
-        """Check if file is a text file that should be analyzed"""
-        if file_path.suffix.lower() in self.supported_extensions:
-            return True
+        # Model responses are cached on disk, in diskcache when it is installed
+        if not use_cache:
+            self.cache = None
+        elif diskcache is not None:
+            self.cache = diskcache.Cache(str(_CACHE_DIR))
+        else:
+            self.cache = FileCache(_CACHE_DIR)
+
+    def is_text_file(self, extension: str, filename: str) -> bool:
+        """Check if file is a text file that should be analyzed
         
-        # Check if it's a text file by mime type
-        mime_type, _ = mimetypes.guess_type(str(file_path))
-        if mime_type and mime_type.startswith('text/'):
+        Both arguments are expected in lowercase, as computed by the walk.
+        """
+        if extension in _SUPPORTED_EXTENSIONS:
             return True
-            
+        
         # Check common files without extensions
-        if file_path.name.lower() in ['makefile', 'dockerfile', 'readme', 'license', 'changelog']:
-            return True
-            
-        return False
-    
-    def should_skip_directory(self, dir_name: str) -> bool:
-        """Check if directory should be skipped"""
-        skip_dirs = {
-            'node_modules', '.git', '.svn', '.hg', '__pycache__',
-            '.pytest_cache', '.mypy_cache', 'venv', 'env', '.env',
-            'build', 'dist', '.next', '.nuxt', 'target', 'bin', 'obj',
-            '.idea', '.vscode', '.vs', 'coverage', '.coverage',
-            'logs', 'log', 'tmp', 'temp', '.tmp', '.temp'
-        }
-        return dir_name.lower() in skip_dirs or dir_name.startswith('.')
+        return filename in _TEXT_FILENAMES
     
     def analyze_repository(self, repo_path: str) -> Dict:
         """Analyze repository structure and content"""
@@ -92,303 +376,454 @@ class RepositoryAnalyzer:
             'repo_path': str(repo_path),
             'structure': {},
             'files': {},
-            'languages': set(),
+            'languages': [],  # Filled in from language_counts after the walk
+            'language_counts': Counter(),  # Files per extension
             'frameworks': set(),
             'dependencies': {},
             'config_files': [],
             'total_files': 0,
             'total_lines': 0,
-            'file_contents_for_ai': []  # Store content for AI analysis
+            'unread_files': 0,  # Files past the read budget or size limit (no line count)
+            '_snippets': []  # File heads for the AI prompt, referenced by ai_snippet_id
         }
         
-        # Walk through directory tree
-        for root, dirs, files in os.walk(repo_path):
-            # Skip unwanted directories
-            dirs[:] = [d for d in dirs if not self.should_skip_directory(d)]
-            
-            root_path = Path(root)
-            relative_root = root_path.relative_to(repo_path)
+        # Pass 1: walk the directory tree with an explicit stack; scandir
+        # exposes the cached dirent type, so only text candidates are stat'ed
+        candidates = []
+        files_to_read = 0
+        bytes_to_read = 0
+        repo_root = str(repo_path)
+        pending_dirs = deque([repo_root])
+        while pending_dirs:
+            current_dir = pending_dirs.pop()
+            try:
+                with os.scandir(current_dir) as it:
+                    entries = list(it)
+            except OSError as e:
+                logger.warning("Warning: Could not read directory %s: %s", current_dir, e)
+                continue
             
-            for file in files:
-                file_path = root_path / file
-                relative_file_path = file_path.relative_to(repo_path)
+            for entry in entries:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    # Skip hidden and unwanted directories
+                    if name[:1] != '.' and name.lower() not in _SKIP_DIRS:
+                        pending_dirs.append(entry.path)
+                    continue
                 
-                if self.is_text_file(file_path):
-                    try:
-                        analysis['total_files'] += 1
-                        
-                        # Read file content
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
-                        
-                        lines = len(content.splitlines())
-                        analysis['total_lines'] += lines
-                        
-                        # Store file info
-                        analysis['files'][str(relative_file_path)] = {
-                            'size': len(content),
-                            'lines': lines,
-                            'extension': file_path.suffix,
-                            'content': content[:2000] if len(content) > 2000 else content  # Limit content for API
-                        }
-                        
-                        # Detect language
-                        if file_path.suffix:
-                            analysis['languages'].add(file_path.suffix.lower())
-                        
-                        # Store content for AI analysis (key files only)
-                        if self.is_key_file_for_analysis(file_path, content):
-                            analysis['file_contents_for_ai'].append({
-                                'path': str(relative_file_path),
-                                'content': content[:1500],  # Limit for AI context
-                                'extension': file_path.suffix
-                            })
-                        
-                        # Basic file type detection (non-AI)
-                        self.detect_basic_file_types(file_path, content, analysis)
-                        
-                    except Exception as e:
-                        print(f"Warning: Could not read file {file_path}: {e}")
-        
-        # Use AI to detect frameworks and technologies
-        print("Using AI to detect frameworks and technologies...")
-        ai_detected = self.ai_detect_frameworks_and_technologies(analysis)
-        analysis['frameworks'].update(ai_detected.get('frameworks', []))
-        analysis['technologies'] = ai_detected.get('technologies', [])
-        analysis['project_type'] = ai_detected.get('project_type', 'Unknown')
-        
-        # Convert sets to lists for JSON serialization
-        analysis['languages'] = list(analysis['languages'])
-        analysis['frameworks'] = list(analysis['frameworks'])
-        
-        # Remove temporary AI content to save memory
-        del analysis['file_contents_for_ai']
+                # Symlinked files are followed, as os.walk listed them too;
+                # this only costs a stat for the links themselves
+                if not entry.is_file():
+                    continue
+                
+                # Lowercase the name and split off the extension once; both
+                # travel with the candidate so nothing re-parses the path later
+                # (a leading dot marks a hidden file, not an extension)
+                filename = name.lower()
+                dot = filename.rfind('.')
+                extension = filename[dot:] if dot > 0 else ''
+                if not self.is_text_file(extension, filename):
+                    continue
+                
+                try:
+                    size = entry.stat().st_size
+                except OSError as e:
+                    logger.warning("Warning: Could not read file %s: %s", entry.path, e)
+                    continue
+                
+                # Huge files, and any file once the read budget is spent, are
+                # only recorded by name and size; package manifests are always
+                # worth opening
+                read = size <= _MAX_ANALYZED_SIZE and (
+                    (files_to_read < _READ_BUDGET_FILES and bytes_to_read < _READ_BUDGET_BYTES)
+                    or filename in _KEY_FILENAMES
+                )
+                if read:
+                    files_to_read += 1
+                    bytes_to_read += min(size, _MAX_READ_BYTES)
+                candidates.append((entry.path, filename, extension, size, read))
+        
+        # Pass 2: read files on a thread pool (the GIL is released while blocked
+        # in read()); map() keeps walk order so results stay deterministic
+        root_prefix_len = len(os.path.join(repo_root, ''))
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            to_read = [candidate for candidate in candidates if candidate[4]]
+            results = executor.map(
+                self._read_one,
+                [candidate[0] for candidate in to_read],
+                [candidate[3] for candidate in to_read]
+            )
+            for file_path, filename, extension, size, read in candidates:
+                analysis['total_files'] += 1
+                relative_file_path = file_path[root_prefix_len:]
+                
+                # Detect language
+                if extension:
+                    analysis['language_counts'][extension] += 1
+                
+                # Basic file type detection (non-AI)
+                if filename in _CONFIG_FILENAMES:
+                    # Relative, so the prompt (and its cache key) does not depend
+                    # on where the repository is checked out
+                    analysis['config_files'].append(relative_file_path)
+                
+                if not read:
+                    analysis['unread_files'] += 1
+                    analysis['files'][relative_file_path] = {
+                        'size': size,
+                        'lines': None,
+                        'extension': extension,
+                        'ai_snippet_id': None
+                    }
+                    continue
+                
+                content, lines, error = next(results)
+                if error is not None:
+                    logger.warning("Warning: Could not read file %s: %s", file_path, error)
+                    continue
+                
+                try:
+                    analysis['total_lines'] += lines
+                    
+                    # Key files for AI analysis, most informative first:
+                    # package/config files, main application files, files
+                    # whose head imports something, then files that mention
+                    # API keys or env vars (needed for the README prerequisites)
+                    # (the regexes scan the head in place, no lowercased copy)
+                    if filename in _KEY_FILENAMES:
+                        priority = 0
+                    elif _KEY_NAME_RE.search(filename):
+                        priority = 1
+                    elif len(content) > 100 and _IMPORT_RE.search(content, 0, 500):
+                        priority = 2
+                    elif _SETUP_RE.search(content, 0, 1000):
+                        priority = 3
+                    elif _IMPORTANT_PATH_RE.search(relative_file_path.lower()):
+                        # Not a key file, but generate_readme still asks for it
+                        priority = 4
+                    else:
+                        priority = None
+                    
+                    # Only files that can reach the prompt keep any content
+                    snippet_id = None
+                    if priority is not None:
+                        snippet_id = len(analysis['_snippets'])
+                        analysis['_snippets'].append({
+                            'path': relative_file_path,
+                            'content': content[:_PROMPT_SNIPPET_CHARS],  # Trimmed further by _fit_to_budget
+                            'extension': extension,
+                            'priority': priority
+                        })
+                    
+                    # Store file info
+                    analysis['files'][relative_file_path] = {
+                        'size': size,
+                        'lines': lines,
+                        'extension': extension,
+                        'ai_snippet_id': snippet_id
+                    }
+                    
+                    # Extract basic dependencies from package.json only
+                    if filename == 'package.json':
+                        try:
+                            package_data = _json_loads(content)
+                        except ValueError as e:  # json and orjson decode errors
+                            logger.warning("Warning: Could not parse %s: %s", file_path, e)
+                            package_data = None
+                        if isinstance(package_data, dict):
+                            for key in ('dependencies', 'devDependencies'):
+                                dependencies = package_data.get(key)
+                                if isinstance(dependencies, dict):
+                                    analysis['dependencies'].update(dependencies)
+                    
+                except Exception as e:
+                    logger.warning("Warning: Could not analyze file %s: %s", file_path, e)
+        
+        # Only the first few key files fit in the prompt, so put the most
+        # representative ones first: by category, then files in the repo's
+        # dominant languages, then shallow paths before deep ones
+        extension_counts = analysis['language_counts']
+        snippets = analysis['_snippets']
+        snippets.sort(key=lambda info: (
+            info['priority'],
+            -extension_counts[info['extension']],
+            info['path'].count(os.sep),
+            info['path']
+        ))
+        for snippet_id, info in enumerate(snippets):
+            analysis['files'][info['path']]['ai_snippet_id'] = snippet_id
+        
+        # generate_readme can only pick the first key files or files in the
+        # sampled structure; drop the content of every other snippet so large
+        # repositories do not hold hundreds of heads until the run ends
+        sampled_files = set(list(analysis['files'])[:_PROMPT_SAMPLE_FILES])
+        key_files_kept = 0
+        for info in snippets:
+            if info['priority'] <= 3 and key_files_kept < _PROMPT_KEY_FILES:
+                key_files_kept += 1
+            elif info['path'] not in sampled_files:
+                info['content'] = None
+        
+        # Convert sets to lists for JSON serialization; sorted so that prompts,
+        # and therefore cache keys, are stable across runs
+        # (language counts go most common first, ties by extension)
+        analysis['languages'] = sorted(extension_counts)
+        analysis['language_counts'] = dict(sorted(extension_counts.items(), key=lambda item: (-item[1], item[0])))
+        analysis['frameworks'] = sorted(analysis['frameworks'])
         
         return analysis
     
-    def is_key_file_for_analysis(self, file_path: Path, content: str) -> bool:
-        """Determine if file is important for AI framework detection"""
-        filename = file_path.name.lower()
-        
-        # Configuration and package files
-        if filename in ['package.json', 'requirements.txt', 'pom.xml', 'build.gradle', 
-                       'cargo.toml', 'go.mod', 'composer.json', 'pyproject.toml', 
-                       'setup.py', 'dockerfile', 'docker-compose.yml', 'makefile']:
-            return True
-        
-        # Main application files
-        if any(name in filename for name in ['main', 'index', 'app', 'server', '__init__']):
-            return True
-        
-        # Files with imports/includes that reveal frameworks
-        if len(content) > 100 and any(keyword in content.lower()[:500] for keyword in 
-                                    ['import', 'require', 'include', 'using', 'from']):
-            return True
-        
-        return False
-    
-    def ai_detect_frameworks_and_technologies(self, analysis: Dict) -> Dict:
-        """Use AI to detect frameworks, technologies, and project type"""
-        
-        # Prepare context for AI
-        context = f"""
-Analyze this codebase to detect frameworks, technologies, and project type.
-
-Repository: {analysis['repo_name']}
-File extensions found: {', '.join(analysis['languages'])}
-Total files: {analysis['total_files']}
-
-Key file contents:
-"""
-        
-        # Add file contents for analysis
-        for file_info in analysis['file_contents_for_ai'][:10]:  # Limit to avoid token limits
-            context += f"\n--- {file_info['path']} ---\n{file_info['content']}\n"
-        
-        prompt = f"""
-Based on the codebase analysis below, identify:
-
-1. **Frameworks**: All frameworks being used (e.g., React, Django, Express.js, Spring Boot, etc.)
-2. **Technologies**: Technologies, libraries, and tools (e.g., Docker, Redis, PostgreSQL, etc.)
-3. **Project Type**: What type of project this is (e.g., Web Application, API, CLI Tool, Library, etc.)
-
-Be comprehensive and look for evidence in:
-- Package/dependency files (package.json, requirements.txt, etc.)
-- Import statements and includes
-- Configuration files
-- Code patterns and structure
-
-Return your analysis as a JSON object with this exact structure:
-{{
-    "frameworks": ["Framework1", "Framework2", ...],
-    "technologies": ["Technology1", "Technology2", ...],
-    "project_type": "Project Type Description"
-}}
-
-Codebase Analysis:
-{context}
-
-Respond with ONLY the JSON object, no additional text:
-"""
-
+    @staticmethod
+    def _read_one(file_path: str, size: int):
+        """Read and decode one file; runs on a worker thread"""
         try:
-            chat_completion = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert software engineer who can identify frameworks, technologies, and project types from code. Always respond with valid JSON only."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model="meta-llama/llama-guard-4-12b",
-                max_tokens=1000,
-                temperature=0.3
-            )
-            
-            response_content = chat_completion.choices[0].message.content.strip()
-            
-            # Try to parse JSON response
+            # A raw descriptor skips the buffered file object
+            fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
             try:
-                return json.loads(response_content)
-            except json.JSONDecodeError:
-                # Extract JSON from response if it contains extra text
-                import re
-                json_match = re.search(r'\{.*\}', response_content, re.DOTALL)
-                if json_match:
-                    return json.loads(json_match.group())
-                else:
-                    print("Warning: Could not parse AI response for framework detection")
-                    return {"frameworks": [], "technologies": [], "project_type": "Unknown"}
-            
-        except Exception as e:
-            print(f"Warning: AI framework detection failed: {e}")
-            return {"frameworks": [], "technologies": [], "project_type": "Unknown"}
+                # Only the head of each file is ever used, so bound the read
+                raw = os.read(fd, min(size, _MAX_READ_BYTES))
+            finally:
+                os.close(fd)
+        except OSError as e:
+            return None, 0, e
+        
+        # Count on the bytes (a C-level scan, no list of lines); a last line
+        # without a newline counts too, unless the read stopped mid-file
+        lines = raw.count(b'\n')
+        if raw and len(raw) == size and not raw.endswith(b'\n'):
+            lines += 1
+        return raw.decode('utf-8', 'ignore'), lines, None
     
-    def detect_basic_file_types(self, file_path: Path, content: str, analysis: Dict):
-        """Basic file type detection for config files and dependencies"""
-        filename = file_path.name.lower()
-        
-        # Just detect config files and basic package managers
-        config_files = [
-            'package.json', 'yarn.lock', 'package-lock.json',
-            'requirements.txt', 'pyproject.toml', 'setup.py', 'pipfile',
-            'pom.xml', 'build.gradle', 'build.gradle.kts',
-            'cargo.toml', 'cargo.lock',
-            'go.mod', 'go.sum',
-            'composer.json', 'composer.lock',
-            'dockerfile', 'docker-compose.yml',
-            'makefile', '.gitignore', 'readme.md'
-        ]
-        
-        if filename in config_files:
-            analysis['config_files'].append(str(file_path))
-            
-        # Extract basic dependencies from package.json only
-        if filename == 'package.json':
-            try:
-                package_data = json.loads(content)
-                if 'dependencies' in package_data:
-                    analysis['dependencies'].update(package_data['dependencies'])
-                if 'devDependencies' in package_data:
-                    analysis['dependencies'].update(package_data['devDependencies'])
-            except:
-                pass
-
-    def generate_readme(self, analysis: Dict) -> str:
-        """Generate README using Groq API"""
-        
-        # Prepare context for the AI
-        context = f"""
-Repository Analysis:
+    @staticmethod
+    def _fit_to_budget(contents: List[str], max_chars: int) -> List[str]:
+        """Truncate contents to max_chars in total, sharing the budget fairly
+        
+        Short contents are kept whole and their unused share goes to the
+        longer ones, so each gets at least max_chars // len(contents).
+        """
+        limits = [0] * len(contents)
+        remaining = max_chars
+        by_length = sorted(range(len(contents)), key=lambda i: len(contents[i]))
+        for position, index in enumerate(by_length):
+            limits[index] = min(len(contents[index]), remaining // (len(contents) - position))
+            remaining -= limits[index]
+        return [content[:limit] for content, limit in zip(contents, limits)]
+    
+    @staticmethod
+    def _cache_key(model: str, system: str, user: str, max_tokens: int, temperature: float, seed) -> str:
+        """Hash the inputs that determine a model response"""
+        # float() so that 0 and 0.0 (or 1 and 1.0) share a cache entry
+        key = f"{model}|{max_tokens}|{float(temperature)}|{seed}|{system}|{user}"
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+    
+    def _cached_chat(self, key: str, create_fn) -> str:
+        """Return the cached response for key, calling create_fn on a miss"""
+        if self.cache is None:
+            return create_fn()
+        
+        response = self.cache.get(key)
+        if response is None:
+            response = create_fn()
+            self.cache.set(key, response, expire=_CACHE_TTL)
+        return response
+    
+    @staticmethod
+    def _report_usage(x_groq):
+        """Log prompt token usage, including tokens served from Groq's prompt cache
+        
+        x_groq is the Groq extension object of the final stream chunk.
+        """
+        usage = getattr(x_groq, 'usage', None)
+        if usage is None:
+            return
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached_tokens = getattr(details, 'cached_tokens', None) or 0
+        logger.info("Prompt tokens: %s (%s cached)", usage.prompt_tokens, cached_tokens)
+    
+    @staticmethod
+    def _parse_detection(response_content: str) -> Dict:
+        """Parse the framework detection JSON returned by the model
+        
+        Always returns a dict with 'frameworks' and 'technologies' as lists of
+        strings and 'project_type' as a string; values of any other shape are
+        dropped with a warning, so detection can never break the README.
+        """
+        detected = {"frameworks": [], "technologies": [], "project_type": "Unknown"}
+        response_content = response_content.strip()
+        try:
+            data = _json_loads(response_content)
+        except ValueError:  # json and orjson decode errors
+            # Extract JSON from response if it contains extra text
+            data = None
+            json_match = _JSON_OBJECT_RE.search(response_content)
+            if json_match:
+                try:
+                    data = _json_loads(json_match.group())
+                except ValueError:
+                    pass
+        if not isinstance(data, dict):
+            logger.warning("Warning: Could not parse AI response for framework detection")
+            return detected
+        
+        for key in ('frameworks', 'technologies'):
+            value = data.get(key, [])
+            if isinstance(value, list) and all(isinstance(item, str) for item in value):
+                detected[key] = value
+            else:
+                logger.warning("Warning: Ignoring malformed '%s' in AI framework detection", key)
+        project_type = data.get('project_type', 'Unknown')
+        if isinstance(project_type, str):
+            detected['project_type'] = project_type
+        else:
+            logger.warning("Warning: Ignoring malformed 'project_type' in AI framework detection")
+        return detected
+    
+    def generate_readme(self, analysis: Dict, output_file=None, temperature: float = 0.7, seed=None) -> str:
+        """Detect frameworks and generate the README with a single Groq API call
+        
+        The response is streamed and the README is written to output_file as
+        it arrives. The detected frameworks, technologies and project type
+        are stored back into the analysis dict. With temperature 0 and a
+        fixed seed, identical input gives repeatable output.
+        """
+        
+        # The ten most common extensions are plenty of evidence for the model
+        top_languages = ', '.join(
+            f"{extension}({count})" for extension, count in Counter(analysis['language_counts']).most_common(10)
+        )
+        
+        # Prepare context for the AI; pieces are collected and joined once
+        context = [f"""
 - Name: {analysis['repo_name']}
 - Total Files: {analysis['total_files']}
 - Total Lines of Code: {analysis['total_lines']}
-- Languages: {', '.join(analysis['languages'])}
-- Frameworks/Technologies: {', '.join(analysis['frameworks'])}
+- Languages (files per extension): {top_languages}
 - Configuration files: {', '.join(analysis['config_files'])}
 
 File Structure (sample):
-"""
+"""]
         
         # Add sample of file structure
-        file_list = list(analysis['files'].keys())[:20]  # Limit for API context
+        file_list = list(analysis['files'].keys())[:_PROMPT_SAMPLE_FILES]  # Limit for API context
         for file_path in file_list:
             file_info = analysis['files'][file_path]
-            context += f"- {file_path} ({file_info['lines']} lines)\n"
+            if file_info['lines'] is None:
+                context.append(f"- {file_path} ({file_info['size']} bytes)\n")
+            else:
+                context.append(f"- {file_path} ({file_info['lines']} lines)\n")
         
-        if len(analysis['files']) > 20:
-            context += f"... and {len(analysis['files']) - 20} more files\n"
+        if len(analysis['files']) > _PROMPT_SAMPLE_FILES:
+            context.append(f"... and {len(analysis['files']) - _PROMPT_SAMPLE_FILES} more files\n")
         
         # Add sample code snippets from key files
-        context += "\nKey File Contents (snippets):\n"
+        context.append("\nKey File Contents (snippets):\n")
         
         # Find important files: entry points, config, or files mentioning API keys/env vars
+        snippets = analysis['_snippets']
         important_files = []
         for f_path_str in file_list:
-            if any(name in f_path_str.lower() for name in ['main', 'index', 'app', 'server', '__init__', 'setup', 'config']):
+            snippet_id = analysis['files'][f_path_str]['ai_snippet_id']
+            if snippet_id is None:
+                continue
+            if _IMPORTANT_PATH_RE.search(f_path_str.lower()):
                 important_files.append(f_path_str)
             else:
-                content_sample = analysis['files'][f_path_str]['content'][:1000].lower()
-                if any(keyword in content_sample for keyword in ['argparse', 'os.getenv', 'api_key', 'api key', 'secret_key']):
+                if _SETUP_RE.search(snippets[snippet_id]['content'], 0, 1000):
                     important_files.append(f_path_str)
         
         important_files = list(dict.fromkeys(important_files))[:5] # Get unique files, limit to 5
         
+        # (path, content) of each file shown to the model
+        selected = []
         for file_path in important_files:
-            if file_path in analysis['files']:
-                content = analysis['files'][file_path]['content']
-                context += f"\n--- {file_path} ---\n{content[:1000]}...\n"
-        
-        prompt = f"""
-Based on the following repository analysis, generate a comprehensive README.md file that includes:
-
-1. **Project Title and Description**: Clear, engaging description of what the project does
-2. **Features**: Key features and capabilities
-3. **Technology Stack**: Languages, frameworks, and tools used
-4. **Prerequisites**: System requirements, dependencies, and **any API keys or environment variables needed**. Look for clues like `os.getenv`, `argparse`, or variable names like `API_KEY`.
-5. **Installation**: Step-by-step setup instructions IF ANY REQUIRED
-6. **Usage**: How to run and use the project with examples. Include command-line arguments if found.
-7. **Project Structure**: Overview of the codebase organization
-8. **Configuration**: Any environment variables or config files needed
-9. **API Documentation**: If applicable, document key endpoints or functions IF ANY PRESENT
-10. **Contributing**: Guidelines for contributors
-11. **License**: License information IF ALREADY MENTIONED
-12. **Contact**: Author/maintainer information IF ALREADY MENTIONED
-
-Make the README professional, well-formatted with proper markdown, and comprehensive enough that someone can understand and set up the project from scratch.
-Pay close attention to the code snippets to find requirements like API keys or specific commands to run the project.
-
-Repository Analysis:
-{context}
-
-Generate a complete README.md file:
-"""
-
-        try:
+            selected.append((file_path, snippets[analysis['files'][file_path]['ai_snippet_id']]['content']))
+        
+        # Top up with the other key files so the model can spot frameworks
+        remaining = _PROMPT_KEY_FILES - len(important_files)  # Limit to avoid token limits
+        for file_info in snippets:
+            # Snippets are sorted by priority; the rest were only kept for
+            # the important-files pick above
+            if remaining <= 0 or file_info['priority'] > 3:
+                break
+            if file_info['path'] not in important_files:
+                selected.append((file_info['path'], file_info['content']))
+                remaining -= 1
+        
+        # The snippet budget is shared out between the chosen files, so small
+        # repositories get whole files and large ones a fair head of each
+        contents = self._fit_to_budget([content for _, content in selected], _PROMPT_SNIPPET_CHARS)
+        for (file_path, _), content in zip(selected, contents):
+            context.append(f"\n--- {file_path} ---\n{content}\n")
+        
+        prompt = _INSTRUCTIONS + ''.join(context)
+        system = _SYSTEM_PROMPT
+        model = "llama-3.1-8b-instant"  # Fast and good for documentation
+        max_tokens = 4500
+        
+        writer = ReadmeStreamWriter(output_file)
+        
+        sampling = {'temperature': temperature}
+        if seed is not None:
+            sampling['seed'] = seed
+        
+        def create() -> str:
             # Call Groq API
-            chat_completion = self.client.chat.completions.create(
+            stream = self.client.chat.completions.create(
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are an expert technical writer and software developer. Generate comprehensive, professional README files that are clear, well-structured, and include all necessary information for users to understand and use the project."
+                        "content": system
                     },
                     {
                         "role": "user",
                         "content": prompt
                     }
                 ],
-                model="llama-3.1-8b-instant",  # Fast and good for documentation
-                max_tokens=4000,
-                temperature=0.7
+                model=model,
+                max_tokens=max_tokens,
+                stream=True,
+                **sampling
             )
-            
-            return chat_completion.choices[0].message.content
-            
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    writer.feed(delta)
+                # Groq reports usage on the final chunk
+                x_groq = getattr(chunk, 'x_groq', None)
+                if getattr(x_groq, 'usage', None) is not None:
+                    self._report_usage(x_groq)
+            return ''.join(writer.parts)
+        
+        try:
+            response_content = self._cached_chat(self._cache_key(model, system, prompt, max_tokens, temperature, seed), create)
         except Exception as e:
             raise Exception(f"Error generating README with Groq API: {e}")
+        
+        if not writer.parts:
+            # Served from the cache, nothing was streamed
+            writer.feed(response_content)
+        readme_content = writer.close()
+        
+        analysis_match = _ANALYSIS_BLOCK_RE.search(response_content)
+        if analysis_match:
+            ai_detected = self._parse_detection(analysis_match.group(1))
+        else:
+            logger.warning("Warning: AI response did not include framework detection")
+            ai_detected = {"frameworks": [], "technologies": [], "project_type": "Unknown"}
+        analysis['frameworks'] = sorted(set(analysis['frameworks']).union(ai_detected['frameworks']))
+        analysis['technologies'] = ai_detected['technologies']
+        analysis['project_type'] = ai_detected['project_type']
+        
+        return readme_content
+
+def write_json(path: Path, data: Dict):
+    """Write data as indented JSON, using orjson when it is installed"""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
 
 def main():
     parser = argparse.ArgumentParser(description="Generate comprehensive README for any repository")
@@ -396,8 +831,27 @@ def main():
     parser.add_argument("--api-key", help="Groq API key (or set GROQ_API_KEY env var)")
     parser.add_argument("--output", "-o", default="README.md", help="Output file name")
     parser.add_argument("--clone", help="Git URL to clone repository")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the Groq API instead of reusing cached responses")
+    parser.add_argument("--temperature", type=float, default=0.7, help="Sampling temperature for README generation (default: 0.7)")
+    parser.add_argument("--seed", type=int, help="Sampling seed passed to the Groq API")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="Use temperature 0 and a fixed seed (1 unless --seed is given) for repeatable output; "
+                             "less varied wording, but responses are safe to cache and share")
+    parser.add_argument("--quiet", "-q", action="store_true", help="Suppress warnings about unreadable or unparsable files")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Also report prompt token usage")
     
     args = parser.parse_args()
+    if args.quiet:
+        log_level = logging.ERROR
+    elif args.verbose:
+        log_level = logging.INFO
+    else:
+        log_level = logging.WARNING
+    logging.basicConfig(format='%(message)s', level=log_level)
+    if args.deterministic:
+        args.temperature = 0.0
+        if args.seed is None:
+            args.seed = 1
     
     # Get API key
     api_key = args.api_key or os.getenv('GROQ_API_KEY')
@@ -409,41 +863,57 @@ def main():
         # Clone repository if URL provided
         if args.clone:
             print(f"Cloning repository from {args.clone}...")
-            os.system(f"git clone {args.clone} {args.repo_path}")
+            # Only the current tree is read, so skip history; no shell is involved,
+            # and '--' stops a URL starting with '-' from being read as an option
+            try:
+                subprocess.run(
+                    ['git', 'clone', '--depth', '1', '--single-branch', '--filter=blob:none', '--', args.clone, args.repo_path],
+                    check=True
+                )
+            except FileNotFoundError:
+                raise Exception("git is required for --clone but was not found on PATH")
+            except subprocess.CalledProcessError as e:
+                raise Exception(f"git clone of {args.clone} failed with exit status {e.returncode}")
         
         # Initialize analyzer
-        analyzer = RepositoryAnalyzer(api_key)
+        analyzer = RepositoryAnalyzer(api_key, use_cache=not args.no_cache)
         
         # Analyze repository
         print(f"Analyzing repository: {args.repo_path}")
         analysis = analyzer.analyze_repository(args.repo_path)
         
         print(f"Found {analysis['total_files']} files with {analysis['total_lines']} total lines")
+        if analysis['unread_files']:
+            print(f"Read budget or size limit reached: {analysis['unread_files']} files were only sized, not read")
         print(f"Languages detected: {', '.join(analysis['languages'])}")
-        print(f"Frameworks detected: {', '.join(analysis['frameworks'])}")
         
-        # Generate README
+        # Detect frameworks and generate README
         print("Generating README with Groq AI...")
-        readme_content = analyzer.generate_readme(analysis)
-        
-        # Save README
+        # The README is streamed into a temp file next to the output as it is
+        # generated, and only replaces the output once the call succeeded, so
+        # a failed or interrupted call leaves an existing README untouched
         output_path = Path(args.repo_path) / args.output
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(readme_content)
+        tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                analyzer.generate_readme(analysis, f, temperature=args.temperature, seed=args.seed)
+            os.replace(tmp_path, output_path)
+        finally:
+            # Only still there if generation failed
+            if tmp_path.exists():
+                tmp_path.unlink()
+        print(f"Frameworks detected: {', '.join(analysis['frameworks'])}")
         
         print(f"README generated successfully: {output_path}")
         
         # Also save analysis for reference
         analysis_path = Path(args.repo_path) / "repository_analysis.json"
-        with open(analysis_path, 'w', encoding='utf-8') as f:
-            # Remove content from files to reduce size
-            analysis_copy = analysis.copy()
-            for file_path in analysis_copy['files']:
-                analysis_copy['files'][file_path] = {
-                    k: v for k, v in analysis_copy['files'][file_path].items() 
-                    if k != 'content'
-                }
-            json.dump(analysis_copy, f, indent=2)
+        # Leave out the prompt snippets and the ids that point into them; the
+        # analysis is not used after this, so strip them in place
+        del analysis['_snippets']
+        for file_info in analysis['files'].values():
+            file_info.pop('ai_snippet_id', None)
+        write_json(analysis_path, analysis)
         
         print(f"Repository analysis saved: {analysis_path}")
         
@@ -0,0 +1,193 @@
+"""
+Tests for the parts of readme_generator that do not call the Groq API.
+Run with: python -m unittest
+"""
+
+import io
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import readme_generator
+from readme_generator import FileCache, ReadmeStreamWriter, RepositoryAnalyzer
+
+ANALYSIS = '<ANALYSIS_JSON>{"frameworks": ["Flask"]}</ANALYSIS_JSON>\n'
+README = '# Demo\n\nSome text with </tags> and <README in it.'
+RESPONSE = ANALYSIS + '<README_MD>\n' + README + '\n</README_MD>\n'
+
+
+def stream(text: str, chunk_size: int) -> str:
+    """Feed text in chunks of chunk_size and return what was written to the file"""
+    output_file = io.StringIO()
+    writer = ReadmeStreamWriter(output_file)
+    for i in range(0, len(text), chunk_size):
+        writer.feed(text[i:i + chunk_size])
+    result = writer.close()
+    assert result == output_file.getvalue()
+    return result
+
+
+class ReadmeStreamWriterTest(unittest.TestCase):
+    def test_whole_response(self):
+        self.assertEqual(stream(RESPONSE, len(RESPONSE)), README + '\n')
+
+    def test_tags_split_across_chunks(self):
+        # Every chunk size splits the opening and closing tags somewhere
+        for chunk_size in range(1, 20):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(stream(RESPONSE, chunk_size), README + '\n')
+
+    def test_text_after_closing_tag_is_ignored(self):
+        self.assertEqual(stream(RESPONSE + 'Trailing chatter', 3), README + '\n')
+
+    def test_missing_tags_fall_back_to_whole_response(self):
+        response = ANALYSIS + README + '\n'
+        for chunk_size in (1, 4, len(response)):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(stream(response, chunk_size), README + '\n')
+
+    def test_stream_cut_off_before_closing_tag(self):
+        response = ANALYSIS + '<README_MD>\n' + README + '\n'
+        for chunk_size in (1, 5, len(response)):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(stream(response, chunk_size), README + '\n')
+
+    def test_stream_cut_off_inside_closing_tag(self):
+        response = ANALYSIS + '<README_MD>\n' + README + '\n</READ'
+        for chunk_size in (1, 5, len(response)):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(stream(response, chunk_size), README + '\n')
+
+    def test_without_output_file(self):
+        writer = ReadmeStreamWriter()
+        writer.feed(RESPONSE)
+        self.assertEqual(writer.close(), README + '\n')
+
+
+class ParseDetectionTest(unittest.TestCase):
+    def test_valid_detection(self):
+        detected = RepositoryAnalyzer._parse_detection(
+            '{"frameworks": ["Flask"], "technologies": ["Docker"], "project_type": "API"}'
+        )
+        self.assertEqual(detected, {'frameworks': ['Flask'], 'technologies': ['Docker'], 'project_type': 'API'})
+
+    def test_json_inside_extra_text(self):
+        detected = RepositoryAnalyzer._parse_detection('Here you go: {"frameworks": ["React"]} Done.')
+        self.assertEqual(detected, {'frameworks': ['React'], 'technologies': [], 'project_type': 'Unknown'})
+
+    def test_malformed_values_are_dropped(self):
+        with self.assertLogs('readme_generator', 'WARNING'):
+            detected = RepositoryAnalyzer._parse_detection(
+                '{"frameworks": [{"name": "Flask"}], "technologies": "Docker", "project_type": 3}'
+            )
+        self.assertEqual(detected, {'frameworks': [], 'technologies': [], 'project_type': 'Unknown'})
+
+    def test_not_an_object(self):
+        for text in ('["Flask"]', 'no json here', '{broken'):
+            with self.subTest(text=text), self.assertLogs('readme_generator', 'WARNING'):
+                detected = RepositoryAnalyzer._parse_detection(text)
+                self.assertEqual(detected, {'frameworks': [], 'technologies': [], 'project_type': 'Unknown'})
+
+
+class FileCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = Path(self.tmp_dir.name) / 'cache'
+        self.cache = FileCache(self.directory)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        self.assertIsNone(self.cache.get('key'))
+        self.cache.set('key', 'response', expire=60)
+        self.assertEqual(self.cache.get('key'), 'response')
+
+    def test_expired_entry_is_removed(self):
+        self.cache.set('key', 'response', expire=60)
+        with mock.patch('time.time', return_value=time.time() + 120):
+            self.assertIsNone(self.cache.get('key'))
+        self.assertFalse((self.directory / 'key.json').exists())
+
+    def test_corrupt_entries_are_misses_and_removed(self):
+        self.directory.mkdir()
+        for key, text in (('broken', '{not json'), ('list', '["response"]'), ('string', '"response"')):
+            with self.subTest(key=key):
+                path = self.directory / f"{key}.json"
+                path.write_text(text)
+                self.assertIsNone(self.cache.get(key))
+                self.assertFalse(path.exists())
+
+    def test_set_removes_expired_entries_of_other_keys(self):
+        self.cache.set('old', 'response', expire=60)
+        self.cache.set('fresh', 'response', expire=60)
+        old_time = time.time() - 120
+        os.utime(self.directory / 'old.json', (old_time, old_time))
+        self.cache.set('new', 'response', expire=60)
+        self.assertEqual(sorted(os.listdir(self.directory)), ['fresh.json', 'new.json'])
+
+    def test_entry_removed_during_sweep_does_not_block_write(self):
+        vanished = mock.Mock()
+        vanished.name = 'gone.json'
+        vanished.stat.side_effect = FileNotFoundError
+        scandir = mock.MagicMock()
+        scandir.return_value.__enter__.return_value = iter([vanished])
+        with mock.patch.object(readme_generator.os, 'scandir', scandir):
+            self.cache.set('key', 'response', expire=60)
+        self.assertEqual(self.cache.get('key'), 'response')
+
+
+class FitToBudgetTest(unittest.TestCase):
+    def test_contents_that_fit_are_unchanged(self):
+        contents = ['a' * 10, 'b' * 50]
+        self.assertEqual(RepositoryAnalyzer._fit_to_budget(contents, 100), contents)
+
+    def test_short_contents_give_their_share_to_long_ones(self):
+        fitted = RepositoryAnalyzer._fit_to_budget(['a' * 10, 'b' * 5000, 'c' * 100, 'd' * 3000], 1000)
+        self.assertEqual([len(content) for content in fitted], [10, 445, 100, 445])
+
+    def test_total_never_exceeds_budget(self):
+        for max_chars in (0, 1, 7, 999):
+            with self.subTest(max_chars=max_chars):
+                fitted = RepositoryAnalyzer._fit_to_budget(['x' * 400, 'y' * 300, 'z' * 5], max_chars)
+                self.assertLessEqual(sum(len(content) for content in fitted), max_chars)
+
+    def test_no_contents(self):
+        self.assertEqual(RepositoryAnalyzer._fit_to_budget([], 100), [])
+
+
+class ReadOneTest(unittest.TestCase):
+    def read(self, data: bytes):
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(data)
+        self.addCleanup(os.unlink, f.name)
+        return RepositoryAnalyzer._read_one(f.name, len(data))
+
+    def test_line_counts(self):
+        for data, lines in ((b'', 0), (b'one', 1), (b'one\n', 1), (b'one\ntwo', 2), (b'one\ntwo\n', 2)):
+            with self.subTest(data=data):
+                content, counted, error = self.read(data)
+                self.assertIsNone(error)
+                self.assertEqual(content, data.decode())
+                self.assertEqual(counted, lines)
+
+    def test_read_stops_at_cap(self):
+        line = b'x' * 99 + b'\n'
+        data = line * (readme_generator._MAX_READ_BYTES // len(line) + 10)
+        content, lines, error = self.read(data)
+        self.assertIsNone(error)
+        self.assertEqual(len(content), readme_generator._MAX_READ_BYTES)
+        # Only the lines that were read count; the partial last one does not
+        self.assertEqual(lines, readme_generator._MAX_READ_BYTES // len(line))
+
+    def test_missing_file(self):
+        content, lines, error = RepositoryAnalyzer._read_one('/nonexistent/file.py', 10)
+        self.assertIsNone(content)
+        self.assertIsInstance(error, OSError)
+
+
+if __name__ == '__main__':
+    unittest.main()